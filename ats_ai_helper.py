@@ -1,42 +1,286 @@
 import gradio as gr
-import PyPDF2
-import docx2txt
 import os
+import httpx
 from dotenv import load_dotenv
-import openai
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from openai import AsyncOpenAI
 import tempfile
+import tiktoken
 import io
+import atexit
+import shutil
+import subprocess
+import hashlib
+import json
+import time
+import asyncio
+from collections import OrderedDict
 from typing import Tuple, Optional
 
+import numpy as np
+
+# Optional: semantic (near-duplicate) cache lookups need faiss
+try:
+    import faiss
+except ImportError:
+    faiss = None
+
 # Load environment variables
 load_dotenv()
 
-# Initialize OpenAI client
-openai.api_key = os.getenv("OPENAI_API_KEY")
+# Shared async OpenAI client, created lazily so the app can start (and show a
+# friendly message) without an API key configured.
+_openai_client: Optional[AsyncOpenAI] = None
+
+def get_openai_client() -> AsyncOpenAI:
+    global _openai_client
+    if _openai_client is None:
+        # One pooled HTTP/2 client shared by all workers: keep-alive skips the
+        # ~100-300ms TLS handshake on every call after the first, and HTTP/2
+        # multiplexes concurrent streams over the same connection.
+        _openai_client = AsyncOpenAI(
+            http_client=httpx.AsyncClient(
+                http2=True,
+                limits=httpx.Limits(max_keepalive_connections=10)
+            )
+        )
+    return _openai_client
+
+class LLMCache:
+    """Cache for chat completion responses.
+
+    Exact hits are looked up by a SHA-256 hash of the full request
+    (model, messages, temperature). When faiss is installed, near-duplicate
+    prompts are also caught by embedding the user prompt and matching against
+    previously cached prompts with cosine similarity >= the threshold.
+    Semantic entries are partitioned per call site (keyed by the system
+    message), since different prompt templates over the same resume and job
+    description are near-identical text but must never answer for each other.
+    Both stores are capped at maxsize and expire after the TTL.
+    """
+
+    def __init__(self, maxsize: int = 128, ttl: float = 86400,
+                 semantic_threshold: float = 0.97):
+        self._store: "OrderedDict[str, tuple]" = OrderedDict()
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.semantic_threshold = semantic_threshold
+        # Per-namespace lists of (timestamp, embedding, response) plus the
+        # faiss index built over each list's embeddings
+        self._semantic_entries: dict = {}
+        self._semantic_indexes: dict = {}
+
+    def _exact_key(self, model: str, messages: list, temperature: float) -> str:
+        payload = json.dumps(
+            {"model": model, "messages": messages, "temperature": temperature},
+            sort_keys=True
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    async def _embed(self, text: str):
+        response = await get_openai_client().embeddings.create(
+            model="text-embedding-3-small",
+            input=text
+        )
+        vector = np.array(response.data[0].embedding, dtype=np.float32)
+        vector /= np.linalg.norm(vector)
+        return vector.reshape(1, -1)
+
+    def _namespace(self, messages: list) -> str:
+        system = messages[0]["content"] if messages else ""
+        return hashlib.sha256(system.encode("utf-8")).hexdigest()
+
+    def _rebuild_index(self, namespace: str):
+        entries = self._semantic_entries[namespace]
+        index = faiss.IndexFlatIP(entries[0][1].shape[1])
+        for _, vector, _ in entries:
+            index.add(vector)
+        self._semantic_indexes[namespace] = index
+
+    def _expire_semantic(self, namespace: str) -> list:
+        """Drop expired entries so nothing outlives the TTL, rebuilding the
+        index when anything was removed."""
+        entries = self._semantic_entries.get(namespace, [])
+        now = time.time()
+        fresh = [entry for entry in entries if now - entry[0] < self.ttl]
+        if len(fresh) != len(entries):
+            self._semantic_entries[namespace] = fresh
+            if fresh:
+                self._rebuild_index(namespace)
+            else:
+                self._semantic_indexes.pop(namespace, None)
+        return fresh
+
+    async def _semantic_lookup(self, namespace: str, user_prompt: str) -> Optional[str]:
+        if faiss is None or not self._expire_semantic(namespace):
+            return None
+        try:
+            scores, ids = self._semantic_indexes[namespace].search(
+                await self._embed(user_prompt), 1)
+            if scores[0][0] >= self.semantic_threshold:
+                return self._semantic_entries[namespace][ids[0][0]][2]
+        except Exception as e:
+            print(f"Semantic cache lookup failed: {e}")
+        return None
+
+    async def _semantic_store(self, namespace: str, user_prompt: str, response_text: str):
+        if faiss is None:
+            return
+        try:
+            vector = await self._embed(user_prompt)
+            entries = self._semantic_entries.setdefault(namespace, [])
+            entries.append((time.time(), vector, response_text))
+            if len(entries) > self.maxsize:
+                del entries[0]
+                self._rebuild_index(namespace)
+            else:
+                index = self._semantic_indexes.get(namespace)
+                if index is None:
+                    index = faiss.IndexFlatIP(vector.shape[1])
+                    self._semantic_indexes[namespace] = index
+                index.add(vector)
+        except Exception as e:
+            print(f"Semantic cache store failed: {e}")
+
+    async def stream_or_call(self, model: str, messages: list,
+                             temperature: float, **kwargs):
+        """Yield response text chunks, streaming from the API on a miss.
+
+        Cache hits (exact or semantic) yield the full cached response in one
+        chunk; misses stream deltas as they arrive and cache the assembled
+        response once the stream completes.
+        """
+        key = self._exact_key(model, messages, temperature)
+        entry = self._store.get(key)
+        if entry is not None:
+            timestamp, response_text = entry
+            if time.time() - timestamp < self.ttl:
+                self._store.move_to_end(key)
+                yield response_text
+                return
+            del self._store[key]
+
+        user_prompt = messages[-1]["content"]
+        namespace = self._namespace(messages)
+        response_text = await self._semantic_lookup(namespace, user_prompt)
+        if response_text is not None:
+            # A near-duplicate answer for a different prompt must not be
+            # promoted into the exact store under this prompt's key
+            yield response_text
+            return
+
+        parts = []
+        stream = await get_openai_client().chat.completions.create(
+            model=model,
+            messages=messages,
+            temperature=temperature,
+            stream=True,
+            **kwargs
+        )
+        async for chunk in stream:
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if delta:
+                parts.append(delta)
+                yield delta
+        response_text = "".join(parts)
+        await self._semantic_store(namespace, user_prompt, response_text)
+
+        self._store[key] = (time.time(), response_text)
+        while len(self._store) > self.maxsize:
+            self._store.popitem(last=False)
 
 class ATSResumeChecker:
-    def __init__(self):
-        self.vectorizer = TfidfVectorizer(stop_words='english', max_features=5000)
-        self.last_resume_text = ""
-        self.last_job_description = ""
+    def __init__(self, prefetch_improvement: bool = False):
+        self._vectorizer = None
+        self.llm_cache = LLMCache()
+        # Extracted resume text keyed by SHA-256 of the file bytes, so
+        # re-evaluating the same file against a new job description skips
+        # parsing. Evicted LRU.
+        self._text_cache: "OrderedDict[str, str]" = OrderedDict()
+        self._text_cache_maxsize = 32
+        # When enabled, the evaluation call also asks GPT-4 for the improved
+        # resume in the same completion, so clicking Improve afterwards costs
+        # no second prefill over the same resume + job description.
+        self.prefetch_improvement = prefetch_improvement
+        # Report temp files created so far; removed on interpreter exit
+        self._report_paths: list = []
+        atexit.register(self._cleanup_reports)
+
+    @property
+    def vectorizer(self):
+        """Lazily built vectorizer, deferring the sklearn import off app boot.
+
+        HashingVectorizer needs no fit, so vocabulary construction stays out
+        of the request path. It also avoids the degenerate IDF a two-document
+        fit_transform produced, where every shared term got the same weight.
+        """
+        if self._vectorizer is None:
+            from sklearn.feature_extraction.text import HashingVectorizer
+            self._vectorizer = HashingVectorizer(
+                stop_words='english',
+                n_features=2**18,
+                alternate_sign=False,
+                norm='l2'
+            )
+        return self._vectorizer
+
+    def _cleanup_reports(self):
+        for path in self._report_paths:
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+
+    def _write_report(self, text: str, prefix: str) -> str:
+        """Write a downloadable report to its own temp file.
+
+        Each request gets a fresh file: with concurrent users, a shared
+        per-type path would serve one user's report to another through a
+        stale download link. The delete=False files have to outlive the
+        request for gr.File to serve them, so they are tracked and removed
+        at interpreter exit instead.
+        """
+        temp_file = tempfile.NamedTemporaryFile(
+            mode='w', delete=False, suffix='.txt', prefix=prefix)
+        temp_file.write(text)
+        temp_file.close()
+        self._report_paths.append(temp_file.name)
+        return temp_file.name
         
     def extract_text_from_pdf(self, pdf_path: str) -> str:
-        """Extract text from PDF file using PyPDF2."""
+        """Extract text from PDF, preferring the fastest available backend.
+
+        Poppler's pdftotext (optional system binary) is tried first; anything
+        going wrong there falls through to PyMuPDF.
+        """
+        if shutil.which("pdftotext"):
+            try:
+                result = subprocess.run(
+                    ["pdftotext", "-layout", "-nopgbrk", pdf_path, "-"],
+                    capture_output=True, text=True, timeout=30
+                )
+                if result.returncode == 0 and result.stdout.strip():
+                    return result.stdout.strip()
+            except Exception as e:
+                print(f"pdftotext failed, falling back to PyMuPDF: {e}")
         try:
-            with open(pdf_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                text = ""
-                for page in pdf_reader.pages:
-                    text += page.extract_text() + "\n"
-                return text.strip()
+            import fitz  # PyMuPDF; deferred so only PDF uploads pay the import
+            doc = fitz.open(pdf_path)
+            try:
+                # Guard against image-only pages yielding nothing
+                parts = [page.get_text("text") or "" for page in doc]
+            finally:
+                doc.close()
+            return "\n".join(parts).strip()
         except Exception as e:
             return f"Error extracting PDF: {str(e)}"
     
     def extract_text_from_docx(self, docx_path: str) -> str:
         """Extract text from DOCX file using docx2txt."""
         try:
+            import docx2txt  # deferred: only DOCX uploads pay the import
+            # Without img_dir, docx2txt never writes images to disk, and it
+            # covers tables, headers, footers and textboxes, which resumes
+            # commonly use for layout
             return docx2txt.process(docx_path)
         except Exception as e:
             return f"Error extracting DOCX: {str(e)}"
@@ -45,30 +289,104 @@ class ATSResumeChecker:
         """Extract text from resume file based on its extension."""
         if not file_path:
             return "No file provided"
-        
+
         file_extension = os.path.splitext(file_path)[1].lower()
-        
+
+        if file_extension not in ('.pdf', '.docx'):
+            return "Unsupported file format. Please upload PDF or DOCX files only."
+
+        try:
+            with open(file_path, 'rb') as file:
+                cache_key = hashlib.sha256(file.read()).hexdigest()
+        except Exception as e:
+            return f"Error reading file: {str(e)}"
+
+        if cache_key in self._text_cache:
+            self._text_cache.move_to_end(cache_key)
+            return self._text_cache[cache_key]
+
         if file_extension == '.pdf':
-            return self.extract_text_from_pdf(file_path)
-        elif file_extension == '.docx':
-            return self.extract_text_from_docx(file_path)
+            text = self.extract_text_from_pdf(file_path)
         else:
-            return "Unsupported file format. Please upload PDF or DOCX files only."
+            text = self.extract_text_from_docx(file_path)
+
+        if not text.startswith("Error"):
+            self._text_cache[cache_key] = text
+            while len(self._text_cache) > self._text_cache_maxsize:
+                self._text_cache.popitem(last=False)
+
+        return text
     
-    def calculate_similarity_score(self, resume_text: str, job_description: str) -> float:
-        """Calculate cosine similarity between resume and job description."""
+    def calculate_similarity_score(self, resume_text: str, job_description: str, jd_vec=None) -> float:
+        """Calculate cosine similarity between resume and job description.
+
+        Accepts an optional precomputed job-description vector so callers
+        that vectorized the JD ahead of time skip re-tokenizing it here.
+        """
         try:
-            documents = [resume_text, job_description]
-            tfidf_matrix = self.vectorizer.fit_transform(documents)
-            similarity = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])
-            return similarity[0][0]
+            if jd_vec is None:
+                jd_vec = self.vectorizer.transform([job_description])
+            resume_vec = self.vectorizer.transform([resume_text])
+            # Rows are L2-normalized by the vectorizer, so the inner product
+            # is the cosine similarity -- no need for cosine_similarity here.
+            return float(resume_vec.multiply(jd_vec).sum())
         except Exception as e:
             print(f"Error calculating similarity: {e}")
             return 0.0
+
+    def batch_score(self, resume_texts: list, job_description: str) -> list:
+        """Score many resumes against one job description in a single pass.
+
+        All documents are vectorized together and every similarity comes out
+        of one sparse matrix product, which only touches the non-zero terms
+        of each resume.
+        """
+        try:
+            matrix = self.vectorizer.transform([job_description] + list(resume_texts))
+            scores = (matrix[1:] @ matrix[0].T).toarray().ravel()
+            # Rows are L2-normalized, so the dot products are cosines already
+            return [float(s) for s in scores]
+        except Exception as e:
+            print(f"Error calculating batch similarity: {e}")
+            return [0.0] * len(resume_texts)
     
-    def get_gpt4_evaluation(self, resume_text: str, job_description: str, similarity_score: float) -> str:
-        """Get detailed evaluation from GPT-4."""
+    def _compress_for_prompt(self, text: str, reference: str, token_budget: int = 3000) -> str:
+        """Trim text to a token budget, keeping the parts most relevant to reference.
+
+        Prompt cost grows linearly with prefill tokens and very long inputs
+        can exceed the model context. Text under the budget passes through
+        untouched; otherwise paragraphs are ranked by cosine similarity
+        against the reference and kept, in their original order, until the
+        budget runs out.
+        """
+        encoding = tiktoken.encoding_for_model("gpt-4")
+        if len(encoding.encode(text)) <= token_budget:
+            return text
+
+        paragraphs = [p for p in text.split("\n\n") if p.strip()]
+        matrix = self.vectorizer.transform([reference] + paragraphs)
+        scores = (matrix[1:] @ matrix[0].T).toarray().ravel()
+
+        kept = set()
+        remaining = token_budget
+        for index in np.argsort(scores)[::-1]:
+            cost = len(encoding.encode(paragraphs[index]))
+            if cost <= remaining:
+                kept.add(index)
+                remaining -= cost
+        if not kept:
+            # No single paragraph fits the budget (e.g. single-newline
+            # formatting makes the whole text one paragraph); hard-truncate
+            # the top-ranked one rather than return an empty prompt section
+            best = paragraphs[int(np.argmax(scores))]
+            return encoding.decode(encoding.encode(best)[:token_budget])
+        return "\n\n".join(paragraphs[i] for i in sorted(kept))
+
+    async def get_gpt4_evaluation(self, resume_text: str, job_description: str, similarity_score: float):
+        """Stream a detailed evaluation from GPT-4."""
         try:
+            resume_text = self._compress_for_prompt(resume_text, job_description, 3000)
+            job_description = self._compress_for_prompt(job_description, resume_text, 2000)
             prompt = f"""
             As an expert ATS analyzer and resume consultant, please evaluate how well this resume matches the job description.
             
@@ -90,24 +408,26 @@ class ATSResumeChecker:
             Format your response clearly with headings and bullet points.
             """
             
-            response = openai.ChatCompletion.create(
+            async for delta in self.llm_cache.stream_or_call(
                 model="gpt-4",
                 messages=[
                     {"role": "system", "content": "You are an expert ATS analyzer and resume consultant with extensive experience in recruitment and resume optimization."},
                     {"role": "user", "content": prompt}
                 ],
-                max_tokens=1500,
-                temperature=0.3
-            )
-            
-            return response.choices[0].message.content
-            
+                temperature=0,
+                seed=42,
+                max_tokens=1500
+            ):
+                yield delta
+
         except Exception as e:
-            return f"Error getting GPT-4 evaluation: {str(e)}"
+            yield f"Error getting GPT-4 evaluation: {str(e)}"
     
-    def generate_improved_resume(self, resume_text: str, job_description: str) -> str:
-        """Generate an improved resume using GPT-4."""
+    async def generate_improved_resume(self, resume_text: str, job_description: str):
+        """Stream an improved resume from GPT-4."""
         try:
+            resume_text = self._compress_for_prompt(resume_text, job_description, 3000)
+            job_description = self._compress_for_prompt(job_description, resume_text, 2000)
             prompt = f"""
             As an expert resume writer and ATS optimization specialist, please rewrite and improve this resume to better match the job description.
             
@@ -128,51 +448,119 @@ class ATSResumeChecker:
             Provide the complete improved resume in a professional format.
             """
             
-            response = openai.ChatCompletion.create(
+            async for delta in self.llm_cache.stream_or_call(
                 model="gpt-4",
                 messages=[
                     {"role": "system", "content": "You are an expert resume writer and ATS optimization specialist with proven success in helping candidates get interviews."},
                     {"role": "user", "content": prompt}
                 ],
-                max_tokens=2000,
-                temperature=0.4
-            )
-            
-            return response.choices[0].message.content
-            
+                temperature=0,
+                seed=42,
+                max_tokens=2000
+            ):
+                yield delta
+
         except Exception as e:
-            return f"Error generating improved resume: {str(e)}"
-    
-    def evaluate_resume(self, resume_file, resume_text: str, job_description: str) -> Tuple[str, str, str]:
-        """Main function to evaluate resume against job description."""
+            yield f"Error generating improved resume: {str(e)}"
+
+    async def get_combined_evaluation(self, resume_text: str, job_description: str, similarity_score: float) -> Tuple[str, str]:
+        """Get the evaluation and the improved resume in one GPT-4 completion.
+
+        Both outputs share the same resume + job description context, so a
+        single completion halves the prompt-token cost versus two calls.
+        Returns (evaluation, improved_resume); raises on malformed output so
+        the caller can fall back to the evaluation-only call.
+        """
+        # Tighter budgets than the single-purpose calls: base gpt-4 has an
+        # 8,192-token context, and 2,000 + 1,200 input tokens plus the
+        # instructions (~400) leave room for the 3,500-token completion with
+        # headroom to spare
+        resume_text = self._compress_for_prompt(resume_text, job_description, 2000)
+        job_description = self._compress_for_prompt(job_description, resume_text, 1200)
+        prompt = f"""
+        As an expert ATS analyzer, resume consultant and resume writer, please evaluate how well this resume matches the job description, and also rewrite the resume to better match it.
+
+        Job Description:
+        {job_description}
+
+        Resume:
+        {resume_text}
+
+        Cosine Similarity Score: {similarity_score:.3f}
+
+        Respond with a JSON object containing exactly two string fields:
+        - "evaluation": the evaluation, covering (1) Overall ATS Score (0-100), (2) key strengths, (3) missing keywords and skills, (4) specific improvement recommendations, (5) ATS optimization suggestions. Format it clearly with headings and bullet points.
+        - "improved_resume": the complete improved resume in a professional format, incorporating relevant keywords, restructured for ATS compatibility, with quantified achievements, while maintaining factual accuracy.
+        """
+
+        parts = []
+        async for delta in self.llm_cache.stream_or_call(
+            model="gpt-4",
+            messages=[
+                {"role": "system", "content": "You are an expert ATS analyzer, resume consultant and resume writer with extensive experience in recruitment and resume optimization. You always respond with valid JSON."},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0,
+            seed=42,
+            max_tokens=3500
+        ):
+            parts.append(delta)
+
+        # Base gpt-4 has no JSON mode, so tolerate prose or code fences
+        # around the object; a failed parse raises and the caller falls back
+        raw = "".join(parts)
+        payload = json.loads(raw[raw.index("{"):raw.rindex("}") + 1])
+        return payload["evaluation"], payload["improved_resume"]
+
+    async def evaluate_resume(self, resume_file, resume_text: str, job_description: str, jd_vec=None, extracted_text: str = ""):
+        """Main function to evaluate resume against job description.
+
+        Async generator yielding (evaluation_markdown, status, report_path,
+        context) tuples as the GPT-4 evaluation streams in. The report path
+        is only set on the final yield; context is the per-session dict that
+        improve_resume consumes, kept in gr.State rather than on the shared
+        checker so concurrent users never read each other's resumes.
+        """
         if not resume_file and not resume_text:
-            return "Please upload a resume file or paste your resume text.", "", ""
-        
+            yield "Please upload a resume file or paste your resume text.", "", "", None
+            return
+
         if not job_description.strip():
-            return "Please provide a job description.", "", ""
+            yield "Please provide a job description.", "", "", None
+            return
         
         # Extract resume text from file if provided, otherwise use pasted text
         if resume_file:
-            resume_text = self.extract_resume_text(resume_file.name)
+            if extracted_text:
+                # Already parsed by the upload handler while the user was
+                # typing the job description
+                resume_text = extracted_text
+            else:
+                # Parse in a worker thread so the event loop keeps serving
+                # other users' token streams during the extraction
+                resume_text = await asyncio.get_running_loop().run_in_executor(
+                    None, self.extract_resume_text, resume_file.name
+                )
         
         if resume_text.startswith("Error") or resume_text.startswith("Unsupported"):
-            return resume_text, "", ""
-        
-        # Store for later use in resume improvement
-        self.last_resume_text = resume_text
-        self.last_job_description = job_description
-        
+            yield resume_text, "", "", None
+            return
+
+        # Session context consumed later by improve_resume
+        context = {
+            "resume_text": resume_text,
+            "job_description": job_description,
+            "improved_resume": "",
+        }
+
         # Calculate similarity score
-        similarity_score = self.calculate_similarity_score(resume_text, job_description)
-        
+        similarity_score = self.calculate_similarity_score(resume_text, job_description, jd_vec)
+
         # Determine pass/fail
         pass_fail = "✅ PASS" if similarity_score >= 0.3 else "❌ FAIL"
         threshold_info = f"Similarity Score: {similarity_score:.3f} (Threshold: 0.30)"
-        
-        # Get GPT-4 evaluation
-        gpt_evaluation = self.get_gpt4_evaluation(resume_text, job_description, similarity_score)
-        
-        # Combine results
+
+        # Stream the GPT-4 evaluation below the score header as it arrives
         evaluation_result = f"""
 ## ATS Resume Evaluation Results
 
@@ -180,33 +568,54 @@ class ATSResumeChecker:
 **{threshold_info}**
 
 ### Detailed Analysis
-{gpt_evaluation}
-        """
-        
-        # Create downloadable evaluation report
-        temp_file = tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.txt', prefix='evaluation_report_')
-        temp_file.write(evaluation_result)
-        temp_file.close()
+"""
+        yield evaluation_result, "Evaluating...", "", context
+        prefetched = False
+        if self.prefetch_improvement:
+            try:
+                evaluation, improved = await self.get_combined_evaluation(
+                    resume_text, job_description, similarity_score
+                )
+                context["improved_resume"] = improved
+                evaluation_result += evaluation
+                prefetched = True
+                yield evaluation_result, "Evaluating...", "", context
+            except Exception as e:
+                print(f"Combined evaluation failed, falling back to evaluation-only call: {e}")
+        if not prefetched:
+            async for delta in self.get_gpt4_evaluation(resume_text, job_description, similarity_score):
+                evaluation_result += delta
+                yield evaluation_result, "Evaluating...", "", context
 
-        return (
+        yield (
             evaluation_result,
             "Evaluation completed! You can now generate an improved resume.",
-            temp_file.name,
+            self._write_report(evaluation_result, 'evaluation_report_'),
+            context,
         )
     
-    def improve_resume(self) -> Tuple[str, str]:
-        """Generate improved resume based on last evaluation."""
-        if not self.last_resume_text or not self.last_job_description:
-            return "Please run an evaluation first before generating improvements.", ""
-        
-        improved_resume = self.generate_improved_resume(self.last_resume_text, self.last_job_description)
-        
-        # Create downloadable file
-        temp_file = tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.txt', prefix='improved_resume_')
-        temp_file.write(improved_resume)
-        temp_file.close()
-        
-        return improved_resume, temp_file.name
+    async def improve_resume(self, context):
+        """Generate improved resume from a session's evaluation context.
+
+        Async generator yielding (improved_resume, file_path) tuples; the
+        download path is only set on the final yield. The context dict comes
+        from that session's evaluate_resume run via gr.State.
+        """
+        if not context or not context.get("resume_text") or not context.get("job_description"):
+            yield "Please run an evaluation first before generating improvements.", ""
+            return
+
+        if context.get("improved_resume"):
+            # Prefetched by the combined evaluation call -- no API round-trip
+            improved_resume = context["improved_resume"]
+            yield improved_resume, ""
+        else:
+            improved_resume = ""
+            async for delta in self.generate_improved_resume(context["resume_text"], context["job_description"]):
+                improved_resume += delta
+                yield improved_resume, ""
+
+        yield improved_resume, self._write_report(improved_resume, 'improved_resume_')
 
 # Initialize the ATS Resume Checker
 ats_checker = ATSResumeChecker()
@@ -299,6 +708,19 @@ with gr.Blocks(title="ATS Resume Checker") as app:
                 )
                 
                 evaluate_btn = gr.Button("🔍 Evaluate Resume", variant="primary", size="lg")
+
+                # JD vector precomputed as the user edits the textbox, so
+                # repeated evaluations against the same JD skip tokenization
+                jd_vec_state = gr.State()
+
+                # Resume text parsed at upload time, hiding parse latency
+                # behind the user's typing time
+                resume_text_state = gr.State("")
+
+                # Per-session evaluation context consumed by the improvement
+                # tab; kept in session state so concurrent users never see
+                # each other's resumes
+                eval_context_state = gr.State()
                 
             with gr.Column(scale=2):
                 evaluation_output = gr.Markdown(
@@ -377,36 +799,58 @@ with gr.Blocks(title="ATS Resume Checker") as app:
         *Note: This tool requires an OpenAI API key to function. Make sure to set your OPENAI_API_KEY environment variable.*
         """)
     
-    # Event handlers
-    def handle_evaluation(resume_file, resume_text, job_desc):
-        if not openai.api_key:
-            return (
+    # Event handlers (async generators so partial GPT-4 output streams to the UI)
+    def precompute_jd_vector(jd):
+        return ats_checker.vectorizer.transform([jd]) if jd and jd.strip() else None
+
+    def preparse_resume(resume_file):
+        return ats_checker.extract_resume_text(resume_file.name) if resume_file else ""
+
+    async def handle_evaluation(resume_file, resume_text, job_desc, jd_vec, preparsed_text):
+        if not os.getenv("OPENAI_API_KEY"):
+            yield (
                 "**OpenAI API key is not set.**\n\n" \
                 "Set the `OPENAI_API_KEY` environment variable or create a `.env` file and restart the app.",
                 "",
                 gr.File(visible=False),
+                None,
             )
-        result, status, report_path = ats_checker.evaluate_resume(resume_file, resume_text, job_desc)
-        if report_path:
-            return result, status, gr.File(value=report_path, visible=True)
-        return result, status, gr.File(visible=False)
-    
-    def handle_improvement():
-        improved_text, file_path = ats_checker.improve_resume()
-        if file_path:
-            return improved_text, gr.File(value=file_path, visible=True)
-        else:
-            return improved_text, gr.File(visible=False)
+            return
+        async for result, status, report_path, context in ats_checker.evaluate_resume(resume_file, resume_text, job_desc, jd_vec, preparsed_text):
+            if report_path:
+                yield result, status, gr.File(value=report_path, visible=True), context
+            else:
+                yield result, status, gr.File(visible=False), context
+
+    async def handle_improvement(context):
+        async for improved_text, file_path in ats_checker.improve_resume(context):
+            if file_path:
+                yield improved_text, gr.File(value=file_path, visible=True)
+            else:
+                yield improved_text, gr.File(visible=False)
     
+    job_description.change(
+        fn=precompute_jd_vector,
+        inputs=job_description,
+        outputs=jd_vec_state
+    )
+
+    # .change also fires when the file is removed, clearing the stale text
+    resume_file.change(
+        fn=preparse_resume,
+        inputs=resume_file,
+        outputs=resume_text_state
+    )
+
     evaluate_btn.click(
         fn=handle_evaluation,
-        inputs=[resume_file, resume_text, job_description],
-        outputs=[evaluation_output, improvement_status, evaluation_download]
+        inputs=[resume_file, resume_text, job_description, jd_vec_state, resume_text_state],
+        outputs=[evaluation_output, improvement_status, evaluation_download, eval_context_state]
     )
-    
+
     improve_btn.click(
         fn=handle_improvement,
-        inputs=[],
+        inputs=[eval_context_state],
         outputs=[improved_resume_output, download_file]
     )
     
@@ -444,6 +888,10 @@ with gr.Blocks(title="ATS Resume Checker") as app:
 
 # Launch the application
 if __name__ == "__main__":
+    # Without a queue, concurrent requests serialize on one worker; the async
+    # handlers release the event loop during OpenAI calls, so many users'
+    # GPT-4 requests can be in flight at once.
+    app.queue(default_concurrency_limit=8, max_size=64)
     app.launch(
         css=custom_css,
         server_name="0.0.0.0",